@@ -2,67 +2,71 @@
 Google Analytics Data API integration for fetching visitor metrics
 """
 
-import os
+import asyncio
 import json
 import logging
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
+from config import CONFIG, Config
+
+try:
+    from google.analytics.data_v1beta import BetaAnalyticsDataAsyncClient
+    from google.analytics.data_v1beta.types import (
+        RunReportRequest,
+        DateRange,
+        Metric,
+    )
+    from google.oauth2 import service_account
+except ImportError:
+    BetaAnalyticsDataAsyncClient = None
 
 logger = logging.getLogger(__name__)
 
+# Display order for the visitor summary line
+SITE_ORDER = ('Wandering Well', 'Daily AI Digest', 'Stock Market Calculator', 'Movie Algorithm', 'AI for You')
+
+
+@lru_cache(maxsize=1)
+def _build_credentials(credentials_json: str):
+    """Parse service account credentials once per credentials JSON"""
+    # Parse credentials from JSON string
+    credentials_info = json.loads(credentials_json)
+    return service_account.Credentials.from_service_account_info(
+        credentials_info,
+        scopes=['https://www.googleapis.com/auth/analytics.readonly']
+    )
+
 
 class AnalyticsFetcher:
     """Fetches visitor data from Google Analytics 4 properties"""
 
-    def __init__(self):
+    def __init__(self, config: Config = CONFIG):
         # GA4 Property IDs for each website
-        # These should be set as environment variables
-        self.properties = {
-            'Wandering Well': os.environ.get('GA_PROPERTY_WANDERING_WELL'),
-            'Daily AI Digest': os.environ.get('GA_PROPERTY_DAILY_AI_DIGEST'),
-            'Stock Market Calculator': os.environ.get('GA_PROPERTY_STOCK_CALCULATOR'),
-            'Movie Algorithm': os.environ.get('GA_PROPERTY_MOVIE_ALGORITHM'),
-            'AI for You': os.environ.get('GA_PROPERTY_AI_FOR_YOU'),
-        }
+        self.properties = dict(config.ga_properties)
 
         # Service account credentials JSON
-        self.credentials_json = os.environ.get('GOOGLE_APPLICATION_CREDENTIALS_JSON')
-
-    def _get_client(self):
-        """Create GA4 Data API client with service account credentials"""
-        try:
-            from google.analytics.data_v1beta import BetaAnalyticsDataClient
-            from google.oauth2 import service_account
-
-            if not self.credentials_json:
-                logger.error("GOOGLE_APPLICATION_CREDENTIALS_JSON not set")
-                return None
-
-            # Parse credentials from JSON string
-            credentials_info = json.loads(self.credentials_json)
-            credentials = service_account.Credentials.from_service_account_info(
-                credentials_info,
-                scopes=['https://www.googleapis.com/auth/analytics.readonly']
-            )
+        self.credentials_json = config.credentials_json
 
-            return BetaAnalyticsDataClient(credentials=credentials)
-
-        except ImportError:
+    def _get_credentials(self):
+        """Return the cached service account credentials"""
+        if BetaAnalyticsDataAsyncClient is None:
             logger.error("google-analytics-data package not installed")
             return None
+
+        if not self.credentials_json:
+            logger.error("GOOGLE_APPLICATION_CREDENTIALS_JSON not set")
+            return None
+
+        try:
+            return _build_credentials(self.credentials_json)
         except Exception as e:
-            logger.error(f"Error creating GA client: {e}")
+            logger.error("Error creating GA client: %s", e)
             return None
 
-    def _get_visitors_for_property(self, client, property_id: str) -> Optional[int]:
+    async def _get_visitors_for_property(self, client, property_id: str) -> Optional[int]:
         """Fetch yesterday's unique visitors for a single property"""
         try:
-            from google.analytics.data_v1beta.types import (
-                RunReportRequest,
-                DateRange,
-                Metric,
-            )
-
             # Get yesterday's date
             yesterday = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
 
@@ -72,16 +76,57 @@ class AnalyticsFetcher:
                 metrics=[Metric(name="activeUsers")],
             )
 
-            response = client.run_report(request)
+            response = await client.run_report(request)
 
             if response.rows:
                 return int(response.rows[0].metric_values[0].value)
             return 0
 
         except Exception as e:
-            logger.error(f"Error fetching data for property {property_id}: {e}")
+            logger.error("Error fetching data for property %s: %s", property_id, e)
+            return None
+
+    async def _batch_get_visitors(self, client, properties: dict) -> dict:
+        """Fetch yesterday's visitors for several properties concurrently"""
+        # batchRunReports only accepts requests for a single property, so
+        # cross-property fetches are issued as concurrent run_report calls
+        counts = await asyncio.gather(
+            *[self._get_visitors_for_property(client, property_id) for property_id in properties.values()]
+        )
+        return dict(zip(properties.keys(), counts))
+
+    async def _single_property_fast_path(self, client, site_name: str, property_id: str) -> Optional[dict]:
+        """Fetch yesterday's visitors when only one property is configured"""
+        visitors = await self._get_visitors_for_property(client, property_id)
+        if visitors is None:
+            logger.warning("Could not fetch data for %s", site_name)
             return None
 
+        logger.info("%s: %s unique visitors", site_name, visitors)
+        return {site_name: visitors}
+
+    async def _fetch_all_async(self, credentials, properties: dict) -> Optional[dict]:
+        """Fetch visitors for all properties over one async gRPC channel"""
+        # The async client is bound to the running event loop, so it is
+        # created per fetch; the parsed credentials are what gets cached
+        async with BetaAnalyticsDataAsyncClient(credentials=credentials) as client:
+            # A lone property needs no gather
+            if len(properties) == 1:
+                site_name, property_id = next(iter(properties.items()))
+                return await self._single_property_fast_path(client, site_name, property_id)
+
+            batch_visitors = await self._batch_get_visitors(client, properties)
+
+        results = {}
+        for site_name, visitors in batch_visitors.items():
+            if visitors is not None:
+                results[site_name] = visitors
+                logger.info("%s: %s unique visitors", site_name, visitors)
+            else:
+                logger.warning("Could not fetch data for %s", site_name)
+
+        return results if results else None
+
     def fetch_all_visitors(self) -> Optional[dict]:
         """Fetch yesterday's visitors for all configured properties"""
         # Check if any properties are configured
@@ -91,34 +136,18 @@ class AnalyticsFetcher:
             logger.warning("No GA4 properties configured")
             return None
 
-        client = self._get_client()
-        if not client:
+        credentials = self._get_credentials()
+        if not credentials:
             return None
 
-        results = {}
-        for site_name, property_id in configured_properties.items():
-            visitors = self._get_visitors_for_property(client, property_id)
-            if visitors is not None:
-                results[site_name] = visitors
-                logger.info(f"{site_name}: {visitors} unique visitors")
-            else:
-                logger.warning(f"Could not fetch data for {site_name}")
-
-        return results if results else None
+        return asyncio.run(self._fetch_all_async(credentials, configured_properties))
 
     def format_visitor_summary(self, visitors: dict) -> str:
         """Format visitor counts into a single summary line"""
         if not visitors:
             return ""
 
-        # Order: Wandering Well, Stock Market Calculator, Movie Algorithm, AI for You
-        site_order = ['Wandering Well', 'Daily AI Digest', 'Stock Market Calculator', 'Movie Algorithm', 'AI for You']
-
-        parts = []
-        for site in site_order:
-            if site in visitors:
-                count = visitors[site]
-                parts.append(f"{count:,} to {site}")
+        parts = [f"{visitors[site]:,} to {site}" for site in SITE_ORDER if site in visitors]
 
         if not parts:
             return ""
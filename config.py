@@ -0,0 +1,44 @@
+"""
+Runtime configuration read once from environment variables
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+# GA4 property ID environment variable for each website, in display order
+GA_PROPERTY_ENV_VARS = (
+    ('Wandering Well', 'GA_PROPERTY_WANDERING_WELL'),
+    ('Daily AI Digest', 'GA_PROPERTY_DAILY_AI_DIGEST'),
+    ('Stock Market Calculator', 'GA_PROPERTY_STOCK_CALCULATOR'),
+    ('Movie Algorithm', 'GA_PROPERTY_MOVIE_ALGORITHM'),
+    ('AI for You', 'GA_PROPERTY_AI_FOR_YOU'),
+)
+
+
+@dataclass(frozen=True)
+class Config:
+    """Credentials and settings for the digest, immutable once loaded"""
+
+    gmail_user: str
+    gmail_password: str
+    recipient_email: str
+    # Service account credentials JSON
+    credentials_json: Optional[str]
+    # (site name, GA4 property ID) pairs; the ID is None when not configured
+    ga_properties: tuple
+
+    @classmethod
+    def from_environ(cls, environ=os.environ) -> 'Config':
+        """Build a Config from environment variables"""
+        gmail_user = environ.get('GMAIL_USER', '')
+        return cls(
+            gmail_user=gmail_user,
+            gmail_password=environ.get('GMAIL_PASSWORD', ''),
+            recipient_email=environ.get('RECIPIENT_EMAIL', gmail_user),
+            credentials_json=environ.get('GOOGLE_APPLICATION_CREDENTIALS_JSON'),
+            ga_properties=tuple((site, environ.get(var)) for site, var in GA_PROPERTY_ENV_VARS),
+        )
+
+
+CONFIG = Config.from_environ()
@@ -2,24 +2,81 @@
 Email formatting and sending via Gmail
 """
 
-import os
+import io
 import logging
 import smtplib
+from html import escape
+from string import Template
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
 import pytz
+from config import CONFIG, Config
 
 logger = logging.getLogger(__name__)
 
+SMTP_HOST = 'smtp.gmail.com'
+SMTP_PORT = 465
+
+ANKARA_TZ = pytz.timezone('Europe/Istanbul')
+
+# Source display order
+SOURCE_ORDER = (
+    'NEW YORK TIMES',
+    'LA PRESSE',
+    'GLOBE AND MAIL',
+    'AXIOS',
+    'SUBSTACK',
+    'PODCASTS',
+)
+
+# Sources shown even when empty, with a "nothing new" note
+ALWAYS_SHOWN_SOURCES = ('SUBSTACK', 'PODCASTS')
+
+# Inline styles shared by every digest email
+BODY_STYLE = 'font-family: Georgia, serif; max-width: 600px; margin: 0 auto; padding: 20px;'
+H1_STYLE = 'color: #333; border-bottom: 2px solid #333; padding-bottom: 10px;'
+DATE_STYLE = 'color: #666; margin-bottom: 10px;'
+VISITOR_SUMMARY_STYLE = ('color: #2e7d32; font-weight: bold; margin-bottom: 30px; padding: 10px; '
+                         'background-color: #e8f5e9; border-radius: 5px;')
+H2_STYLE = 'color: #1a1a1a; margin-top: 30px; font-size: 18px; text-transform: uppercase; letter-spacing: 1px;'
+EMPTY_SOURCE_STYLE = 'color: #888; font-style: italic; margin-left: 15px;'
+H3_STYLE = 'color: #555; font-size: 14px; margin: 15px 0 10px 0;'
+UL_STYLE = 'list-style: none; padding: 0; margin: 0;'
+LI_STYLE = 'margin-bottom: 15px; padding-left: 15px; border-left: 3px solid #ddd;'
+LINK_STYLE = 'color: #0066cc; text-decoration: none; font-weight: bold;'
+SUMMARY_STYLE = 'color: #666; font-size: 14px;'
+HR_STYLE = 'margin-top: 40px; border: none; border-top: 1px solid #ddd;'
+FOOTER_STYLE = 'color: #999; font-size: 12px; text-align: center;'
+
+# HTML fragments, filled in with already-escaped text; each ends its own line
+VISITOR_SUMMARY_HTML = f'<p style="{VISITOR_SUMMARY_STYLE}">{{}}</p>\n'
+SOURCE_HTML = f'<h2 style="{H2_STYLE}">{{}}</h2>\n'
+EMPTY_SOURCE_HTML = f'<p style="{EMPTY_SOURCE_STYLE}">{{}}</p>\n'
+SECTION_HTML = f'<h3 style="{H3_STYLE}">{{}}</h3>\n'
+HEADLINE_LIST_OPEN_HTML = f'<ul style="{UL_STYLE}">\n'
+HEADLINE_OPEN_HTML = f'<li style="{LI_STYLE}">\n'
+HEADLINE_LINK_HTML = f'<a href="{{url}}" style="{LINK_STYLE}">{{title}}</a>\n'
+HEADLINE_TITLE_HTML = '<strong>{}</strong>\n'
+HEADLINE_SUMMARY_HTML = f'<br><span style="{SUMMARY_STYLE}">{{}}</span>\n'
+
+EMAIL_HTML_HEADER = Template(f'''<html><body style="{BODY_STYLE}">
+<h1 style="{H1_STYLE}">Daily News Digest</h1>
+<p style="{DATE_STYLE}">$date</p>
+''')
+
+EMAIL_HTML_FOOTER = f'''<hr style="{HR_STYLE}">
+<p style="{FOOTER_STYLE}">Delivered by Daily News Digest</p>
+</body></html>'''
+
 
 class EmailSender:
     """Handles email formatting and sending via Gmail SMTP"""
 
-    def __init__(self):
-        self.gmail_user = os.environ.get('GMAIL_USER', '')
-        self.gmail_password = os.environ.get('GMAIL_PASSWORD', '')
-        self.recipient_email = os.environ.get('RECIPIENT_EMAIL', self.gmail_user)
+    def __init__(self, config: Config = CONFIG):
+        self.gmail_user = config.gmail_user
+        self.gmail_password = config.gmail_password
+        self.recipient_email = config.recipient_email
 
         if not self.gmail_user or not self.gmail_password:
             raise ValueError(
@@ -27,76 +84,66 @@ class EmailSender:
                 "Set GMAIL_USER and GMAIL_PASSWORD environment variables."
             )
 
-    def format_email_body(self, all_headlines: dict, visitor_summary: str = None) -> tuple[str, str]:
+        # Authenticated SMTP connection, opened on first send and reused
+        self._smtp = None
+
+    def format_email_body(self, all_headlines: dict, visitor_summary: str = None,
+                          now: datetime = None) -> tuple[str, str]:
         """Format headlines into plain text and HTML email bodies"""
-        # Source display order
-        source_order = [
-            'NEW YORK TIMES',
-            'LA PRESSE',
-            'GLOBE AND MAIL',
-            'AXIOS',
-            'SUBSTACK',
-            'PODCASTS'
-        ]
-
-        text_lines = []
-        html_parts = ['<html><body style="font-family: Georgia, serif; max-width: 600px; margin: 0 auto; padding: 20px;">']
-
-        ankara_tz = pytz.timezone('Europe/Istanbul')
-        current_date = datetime.now(ankara_tz)
-        date_str = current_date.strftime("%A, %B %d, %Y")
+        # Write both bodies straight into buffers; bound writes skip attribute lookups
+        text_buf = io.StringIO()
+        html_buf = io.StringIO()
+        t = text_buf.write
+        w = html_buf.write
 
-        html_parts.append(f'<h1 style="color: #333; border-bottom: 2px solid #333; padding-bottom: 10px;">Daily News Digest</h1>')
-        html_parts.append(f'<p style="color: #666; margin-bottom: 10px;">{date_str}</p>')
+        current_date = now or datetime.now(ANKARA_TZ)
+        date_str = current_date.strftime("%A, %B %d, %Y")
 
-        text_lines.append(f"DAILY NEWS DIGEST - {date_str}")
-        text_lines.append("=" * 50)
+        t(f"DAILY NEWS DIGEST - {date_str}\n")
+        t("=" * 50 + "\n")
+        w(EMAIL_HTML_HEADER.substitute(date=escape(date_str)))
 
         # Add visitor analytics summary at the top
         if visitor_summary:
-            text_lines.append(f"\n{visitor_summary}")
-            html_parts.append(f'<p style="color: #2e7d32; font-weight: bold; margin-bottom: 30px; padding: 10px; background-color: #e8f5e9; border-radius: 5px;">{visitor_summary}</p>')
+            t(f"\n{visitor_summary}\n")
+            w(VISITOR_SUMMARY_HTML.format(escape(visitor_summary)))
 
-        text_lines.append("")
+        t("\n")
 
-        for source in source_order:
+        for source in SOURCE_ORDER:
             if source not in all_headlines:
                 continue
 
-            sections = all_headlines[source]
-
-            # Check if source has any content
-            has_content = any(headlines for headlines in sections.values() if headlines)
+            # Collect non-empty sections once; section names only matter when there are several
+            non_empty = [(name, headlines) for name, headlines in all_headlines[source].items() if headlines]
+            has_content = bool(non_empty)
+            show_section_names = len(non_empty) > 1
 
             # Always show SUBSTACK and PODCASTS sections
-            if not has_content and source not in ['SUBSTACK', 'PODCASTS']:
+            if not has_content and source not in ALWAYS_SHOWN_SOURCES:
                 continue
 
             # Source header
-            text_lines.append(f"\n{source}")
-            text_lines.append("-" * len(source))
+            t(f"\n{source}\n")
+            t("-" * len(source) + "\n")
 
-            html_parts.append(f'<h2 style="color: #1a1a1a; margin-top: 30px; font-size: 18px; text-transform: uppercase; letter-spacing: 1px;">{source}</h2>')
+            w(SOURCE_HTML.format(escape(source)))
 
             if not has_content:
                 if source == 'SUBSTACK':
                     msg = "No new posts in the last 24 hours"
                 else:
                     msg = "No new episodes in the last 48 hours"
-                text_lines.append(f"  {msg}")
-                html_parts.append(f'<p style="color: #888; font-style: italic; margin-left: 15px;">{msg}</p>')
+                t(f"  {msg}\n")
+                w(EMPTY_SOURCE_HTML.format(msg))
                 continue
 
-            for section_name, headlines in sections.items():
-                if not headlines:
-                    continue
-
-                # Show section name if multiple sections
-                if len(sections) > 1:
-                    text_lines.append(f"\n  {section_name}:")
-                    html_parts.append(f'<h3 style="color: #555; font-size: 14px; margin: 15px 0 10px 0;">{section_name}</h3>')
+            for section_name, headlines in non_empty:
+                if show_section_names:
+                    t(f"\n  {section_name}:\n")
+                    w(SECTION_HTML.format(escape(section_name)))
 
-                html_parts.append('<ul style="list-style: none; padding: 0; margin: 0;">')
+                w(HEADLINE_LIST_OPEN_HTML)
 
                 for headline in headlines:
                     title = headline.get('title', '')
@@ -107,45 +154,71 @@ class EmailSender:
                         continue
 
                     # Plain text format
+                    t(f"  - {title}\n")
                     if url:
-                        text_lines.append(f"  - {title}")
-                        text_lines.append(f"    {url}")
-                    else:
-                        text_lines.append(f"  - {title}")
+                        t(f"    {url}\n")
 
                     if summary:
-                        text_lines.append(f"    {summary}")
+                        t(f"    {summary}\n")
 
                     # HTML format
-                    html_parts.append('<li style="margin-bottom: 15px; padding-left: 15px; border-left: 3px solid #ddd;">')
+                    w(HEADLINE_OPEN_HTML)
                     if url:
-                        html_parts.append(f'<a href="{url}" style="color: #0066cc; text-decoration: none; font-weight: bold;">{title}</a>')
+                        w(HEADLINE_LINK_HTML.format(url=escape(url), title=escape(title)))
                     else:
-                        html_parts.append(f'<strong>{title}</strong>')
+                        w(HEADLINE_TITLE_HTML.format(escape(title)))
 
                     if summary:
-                        html_parts.append(f'<br><span style="color: #666; font-size: 14px;">{summary}</span>')
+                        w(HEADLINE_SUMMARY_HTML.format(escape(summary)))
 
-                    html_parts.append('</li>')
+                    w('</li>\n')
 
-                html_parts.append('</ul>')
+                w('</ul>\n')
 
-            text_lines.append("")
+            t("\n")
 
         # Footer
-        text_lines.append("\n" + "=" * 50)
-        text_lines.append("Delivered by Daily News Digest")
-
-        html_parts.append('<hr style="margin-top: 40px; border: none; border-top: 1px solid #ddd;">')
-        html_parts.append('<p style="color: #999; font-size: 12px; text-align: center;">Delivered by Daily News Digest</p>')
-        html_parts.append('</body></html>')
-
-        return '\n'.join(text_lines), '\n'.join(html_parts)
+        t("\n" + "=" * 50 + "\n")
+        t("Delivered by Daily News Digest")
+        w(EMAIL_HTML_FOOTER)
+
+        return text_buf.getvalue(), html_buf.getvalue()
+
+    def _get_smtp(self) -> smtplib.SMTP_SSL:
+        """Return the authenticated SMTP connection, opening it if needed"""
+        if self._smtp is None:
+            logger.info("Connecting to Gmail SMTP...")
+            server = smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT)
+            try:
+                server.login(self.gmail_user, self.gmail_password)
+            except Exception:
+                server.close()
+                raise
+            self._smtp = server
+        return self._smtp
+
+    def _send_message(self, msg: MIMEMultipart):
+        """Send a message over the shared connection, reconnecting once if dropped"""
+        try:
+            self._get_smtp().send_message(msg)
+        except smtplib.SMTPServerDisconnected:
+            self._smtp = None
+            self._get_smtp().send_message(msg)
+
+    def close(self):
+        """Close the shared SMTP connection if one is open"""
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            self._smtp.close()
+        finally:
+            self._smtp = None
 
-    def get_subject(self) -> str:
+    def get_subject(self, now: datetime = None) -> str:
         """Generate email subject with current date"""
-        ankara_tz = pytz.timezone('Europe/Istanbul')
-        current_date = datetime.now(ankara_tz)
+        current_date = now or datetime.now(ANKARA_TZ)
         return f"Daily News Digest - {current_date.strftime('%B %d, %Y')}"
 
     def send_daily_digest(self, all_headlines: dict, visitor_summary: str = None) -> bool:
@@ -155,8 +228,9 @@ class EmailSender:
                 logger.warning("No headlines to send")
                 return False
 
-            subject = self.get_subject()
-            text_body, html_body = self.format_email_body(all_headlines, visitor_summary)
+            now = datetime.now(ANKARA_TZ)
+            subject = self.get_subject(now)
+            text_body, html_body = self.format_email_body(all_headlines, visitor_summary, now)
 
             # Create message
             msg = MIMEMultipart('alternative')
@@ -169,12 +243,9 @@ class EmailSender:
             msg.attach(MIMEText(html_body, 'html'))
 
             # Send via Gmail SMTP
-            logger.info(f"Connecting to Gmail SMTP...")
-            with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-                server.login(self.gmail_user, self.gmail_password)
-                server.send_message(msg)
+            self._send_message(msg)
 
-            logger.info(f"Email sent successfully to {self.recipient_email}")
+            logger.info("Email sent successfully to %s", self.recipient_email)
             return True
 
         except smtplib.SMTPAuthenticationError:
@@ -186,5 +257,5 @@ class EmailSender:
             return False
 
         except Exception as e:
-            logger.error(f"Error sending email: {e}", exc_info=True)
+            logger.error("Error sending email: %s", e, exc_info=True)
             return False
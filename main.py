@@ -6,10 +6,12 @@ Fetches headlines from news sources via RSS feeds and sends email digest
 
 import logging
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import pytz
+from typing import Optional
 from scrapers import NewsScrapers
-from email_sender import EmailSender
+from email_sender import ANKARA_TZ, EmailSender
 from analytics import AnalyticsFetcher
 
 # Configure logging
@@ -24,65 +26,46 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def fetch_visitor_summary(analytics: AnalyticsFetcher) -> Optional[str]:
+    """Fetch website analytics and format them as a summary line"""
+    logger.info("Fetching website analytics...")
+    try:
+        visitors = analytics.fetch_all_visitors()
+        if visitors:
+            visitor_summary = analytics.format_visitor_summary(visitors)
+            logger.info("Analytics: %s", visitor_summary)
+            return visitor_summary
+        logger.info("No analytics data available")
+    except Exception as e:
+        logger.warning("Could not fetch analytics: %s", e)
+    return None
+
+
+def fetch_headlines(scrapers: NewsScrapers, substack_accounts: list, podcast_feeds: dict) -> dict:
+    """Fetch every RSS source in one concurrent batch"""
+    logger.info("Fetching news feeds...")
+    start = time.monotonic()
+    all_headlines = scrapers.fetch_all(
+        substack_accounts,
+        podcast_feeds,
+        substack_hours=24,
+        podcast_hours=48
+    )
+    logger.info("Fetched news feeds in %.1fs", time.monotonic() - start)
+    return all_headlines
+
+
 def main():
     """Main function to orchestrate news fetching and email sending"""
     try:
-        ankara_tz = pytz.timezone('Europe/Istanbul')
-        current_time = datetime.now(ankara_tz)
-        logger.info(f"Starting daily news aggregation at {current_time.strftime('%Y-%m-%d %H:%M %Z')}")
+        current_time = datetime.now(ANKARA_TZ)
+        logger.info("Starting daily news aggregation at %s", current_time.strftime('%Y-%m-%d %H:%M %Z'))
 
         scrapers = NewsScrapers()
         email_sender = EmailSender()
         analytics = AnalyticsFetcher()
 
-        # Fetch website analytics
-        visitor_summary = None
-        logger.info("Fetching website analytics...")
-        try:
-            visitors = analytics.fetch_all_visitors()
-            if visitors:
-                visitor_summary = analytics.format_visitor_summary(visitors)
-                logger.info(f"Analytics: {visitor_summary}")
-            else:
-                logger.info("No analytics data available")
-        except Exception as e:
-            logger.warning(f"Could not fetch analytics: {e}")
-
-        all_headlines = {}
-
-        # NY Times (RSS feeds - most reliable)
-        logger.info("Fetching NY Times...")
-        nyt_headlines = scrapers.fetch_nytimes()
-        if nyt_headlines:
-            all_headlines['NEW YORK TIMES'] = nyt_headlines
-            total = sum(len(h) for h in nyt_headlines.values())
-            logger.info(f"Fetched {total} NY Times headlines")
-
-        # Globe and Mail (RSS feeds)
-        logger.info("Fetching Globe and Mail...")
-        globe_headlines = scrapers.fetch_globe_and_mail()
-        if globe_headlines:
-            all_headlines['GLOBE AND MAIL'] = globe_headlines
-            total = sum(len(h) for h in globe_headlines.values())
-            logger.info(f"Fetched {total} Globe and Mail headlines")
-
-        # La Presse (RSS feeds - switching from web scraping)
-        logger.info("Fetching La Presse...")
-        lapresse_headlines = scrapers.fetch_lapresse()
-        if lapresse_headlines:
-            all_headlines['LA PRESSE'] = lapresse_headlines
-            total = sum(len(h) for h in lapresse_headlines.values())
-            logger.info(f"Fetched {total} La Presse headlines")
-
-        # Axios (RSS feed)
-        logger.info("Fetching Axios...")
-        axios_headlines = scrapers.fetch_axios()
-        if axios_headlines:
-            all_headlines['AXIOS'] = {'Top Stories': axios_headlines}
-            logger.info(f"Fetched {len(axios_headlines)} Axios headlines")
-
         # Substack accounts (24-hour window)
-        logger.info("Checking Substacks...")
         substack_accounts = [
             'everydayai',
             'understandingai',
@@ -90,23 +73,42 @@ def main():
             'darioamodei',
             'sineadbovell'
         ]
-        substack_posts = scrapers.fetch_substacks(substack_accounts, hours=24)
-        all_headlines['SUBSTACK'] = {'AI Writers': substack_posts if substack_posts else []}
-        if substack_posts:
-            logger.info(f"Found {len(substack_posts)} recent Substack posts")
-        else:
-            logger.info("No recent Substack posts")
 
         # Podcasts (48-hour window)
-        logger.info("Checking Podcasts...")
         podcast_feeds = {
             'The Cognitive Revolution': 'https://feeds.megaphone.fm/RINTP3108857801',
             'Ezra Klein Show': 'https://feeds.simplecast.com/82FI35Px'
         }
-        podcast_episodes = scrapers.fetch_podcasts(podcast_feeds, hours=48)
-        all_headlines['PODCASTS'] = {'New Episodes': podcast_episodes if podcast_episodes else []}
+
+        # Analytics and RSS feeds share no state, so fetch them side by side
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            analytics_future = executor.submit(fetch_visitor_summary, analytics)
+            headlines_future = executor.submit(
+                fetch_headlines,
+                scrapers,
+                substack_accounts,
+                podcast_feeds
+            )
+            visitor_summary = analytics_future.result()
+            all_headlines = headlines_future.result()
+
+        for source, label in [('NEW YORK TIMES', 'NY Times'),
+                              ('GLOBE AND MAIL', 'Globe and Mail'),
+                              ('LA PRESSE', 'La Presse'),
+                              ('AXIOS', 'Axios')]:
+            if source in all_headlines:
+                total = sum(len(h) for h in all_headlines[source].values())
+                logger.info("Fetched %d %s headlines", total, label)
+
+        substack_posts = all_headlines['SUBSTACK']['AI Writers']
+        if substack_posts:
+            logger.info("Found %d recent Substack posts", len(substack_posts))
+        else:
+            logger.info("No recent Substack posts")
+
+        podcast_episodes = all_headlines['PODCASTS']['New Episodes']
         if podcast_episodes:
-            logger.info(f"Found {len(podcast_episodes)} recent podcast episodes")
+            logger.info("Found %d recent podcast episodes", len(podcast_episodes))
         else:
             logger.info("No recent podcast episodes")
 
@@ -116,7 +118,10 @@ def main():
             return 1
 
         logger.info("Sending email digest...")
-        success = email_sender.send_daily_digest(all_headlines, visitor_summary=visitor_summary)
+        try:
+            success = email_sender.send_daily_digest(all_headlines, visitor_summary=visitor_summary)
+        finally:
+            email_sender.close()
 
         if success:
             logger.info("Daily news digest sent successfully!")
@@ -126,7 +131,7 @@ def main():
             return 1
 
     except Exception as e:
-        logger.error(f"Error in main execution: {str(e)}", exc_info=True)
+        logger.error("Error in main execution: %s", e, exc_info=True)
         return 1
 
 
@@ -2,14 +2,54 @@
 News fetching via RSS feeds - reliable and respectful of source sites
 """
 
+import asyncio
+import email.utils
+import html
+import json
 import logging
-from datetime import datetime, timedelta
+import os
+import re
+from datetime import datetime, timedelta, timezone
 from typing import Optional
+import aiohttp
 import feedparser
-from bs4 import BeautifulSoup
 
 logger = logging.getLogger(__name__)
 
+# Shared connection pool size and per-run timeout for feed downloads
+MAX_CONNECTIONS = 20
+FEED_TIMEOUT_SECONDS = 30
+
+# ETag / Last-Modified validators and bodies from the previous run
+FEED_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'feed_cache.json')
+
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+
+NYTIMES_FEEDS = {
+    'Top Stories': 'https://rss.nytimes.com/services/xml/rss/nyt/HomePage.xml',
+    'World': 'https://rss.nytimes.com/services/xml/rss/nyt/World.xml',
+    'Opinion': 'https://rss.nytimes.com/services/xml/rss/nyt/Opinion.xml'
+}
+
+GLOBE_AND_MAIL_FEEDS = {
+    'Canada': 'https://www.theglobeandmail.com/arc/outboundfeeds/rss/category/canada/',
+    'Politics': 'https://www.theglobeandmail.com/arc/outboundfeeds/rss/category/politics/',
+    'Opinion': 'https://www.theglobeandmail.com/arc/outboundfeeds/rss/category/opinion/'
+}
+
+# La Presse RSS feeds
+LAPRESSE_FEEDS = {
+    'Actualités': 'https://www.lapresse.ca/actualites/rss',
+    'International': 'https://www.lapresse.ca/international/rss',
+    'Affaires': 'https://www.lapresse.ca/affaires/rss'
+}
+
+# Axios main RSS feed
+AXIOS_FEEDS = {
+    'Top Stories': 'https://api.axios.com/feed/'
+}
+
 
 class NewsScrapers:
     """RSS-based news fetchers for various sources"""
@@ -21,27 +61,109 @@ class NewsScrapers:
         """Remove HTML tags and clean text"""
         if not text:
             return ""
-        soup = BeautifulSoup(text, 'html.parser')
-        clean = soup.get_text()
-        clean = ' '.join(clean.split())
-        return clean.strip()
+        clean = html.unescape(_TAG_RE.sub('', text))
+        return _WS_RE.sub(' ', clean).strip()
 
     def _truncate(self, text: str, length: int = 200) -> str:
         """Truncate text to specified length"""
         if not text or len(text) <= length:
             return text
-        return text[:length].rsplit(' ', 1)[0] + "..."
+        # Cut at the last space within the limit, or hard-cut if there is none
+        idx = text.rfind(' ', 0, length)
+        if idx >= 0:
+            return text[:idx] + "..."
+        return text[:length] + "..."
+
+    def _load_feed_cache(self) -> dict:
+        """Load cached feed validators and bodies from disk"""
+        try:
+            with open(FEED_CACHE_PATH, encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning("Could not read feed cache: %s", e)
+            return {}
+
+    def _save_feed_cache(self, cache: dict):
+        """Persist feed validators and bodies for the next run"""
+        try:
+            with open(FEED_CACHE_PATH, 'w', encoding='utf-8') as f:
+                json.dump(cache, f)
+        except Exception as e:
+            logger.warning("Could not write feed cache: %s", e)
+
+    async def _download_feed(self, session: aiohttp.ClientSession, url: str, cache: dict) -> Optional[tuple]:
+        """Download a feed body and its response headers, revalidating cached copies"""
+        cached = cache.get(url)
+        request_headers = {}
+        if cached:
+            if cached.get('etag'):
+                request_headers['If-None-Match'] = cached['etag']
+            if cached.get('modified'):
+                request_headers['If-Modified-Since'] = cached['modified']
 
-    def _parse_feed(self, url: str, max_items: int = 6) -> list:
-        """Parse RSS feed and return entries"""
         try:
-            feed = feedparser.parse(url)
+            async with session.get(url, headers=request_headers) as response:
+                if response.status == 304 and cached:
+                    logger.debug("Feed not modified: %s", url)
+                    # Bodies are stored as latin-1 text, which round-trips any bytes
+                    body = cached['body'].encode('latin-1')
+                    return body, {'content-type': cached['content_type'], 'content-location': url}
+
+                response.raise_for_status()
+                body = await response.read()
+                headers = {
+                    'content-type': response.headers.get('Content-Type', ''),
+                    'content-location': str(response.url),
+                }
+
+                etag = response.headers.get('ETag')
+                modified = response.headers.get('Last-Modified')
+                if etag or modified:
+                    cache[url] = {
+                        'etag': etag,
+                        'modified': modified,
+                        'content_type': headers['content-type'],
+                        'body': body.decode('latin-1'),
+                    }
+                else:
+                    cache.pop(url, None)
+
+                return body, headers
+        except Exception as e:
+            logger.error("Error downloading feed %s: %s", url, e)
+            return None
+
+    async def _download_feeds(self, urls: list, cache: dict) -> dict:
+        """Download all feeds over one shared keep-alive session"""
+        connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS)
+        timeout = aiohttp.ClientTimeout(total=FEED_TIMEOUT_SECONDS)
+        headers = {'User-Agent': feedparser.USER_AGENT}
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+            responses = await asyncio.gather(*[self._download_feed(session, url, cache) for url in urls])
+        return dict(zip(urls, responses))
+
+    def _parse_feed(self, url: str, response: Optional[tuple]) -> list:
+        """Parse a downloaded RSS feed and return entries"""
+        if response is None:
+            return []
+        body, headers = response
+        try:
+            # Summaries are tag-stripped by _clean_html and escaped in the email, so
+            # feedparser's own HTML sanitizing and URI rewriting is wasted work
+            feed = feedparser.parse(
+                body,
+                response_headers=headers,
+                sanitize_html=False,
+                resolve_relative_uris=False
+            )
             if feed.bozo and not feed.entries:
-                logger.warning(f"Feed parse error for {url}: {feed.bozo_exception}")
+                logger.warning("Feed parse error for %s: %s", url, feed.bozo_exception)
                 return []
-            return feed.entries[:max_items]
+            return feed.entries
         except Exception as e:
-            logger.error(f"Error parsing feed {url}: {e}")
+            logger.error("Error parsing feed %s: %s", url, e)
             return []
 
     def _entry_to_headline(self, entry, include_summary: bool = True) -> Optional[dict]:
@@ -65,73 +187,28 @@ class NewsScrapers:
 
         return headline
 
-    def fetch_nytimes(self) -> dict:
-        """Fetch NY Times headlines via official RSS feeds"""
-        feeds = {
-            'Top Stories': 'https://rss.nytimes.com/services/xml/rss/nyt/HomePage.xml',
-            'World': 'https://rss.nytimes.com/services/xml/rss/nyt/World.xml',
-            'Opinion': 'https://rss.nytimes.com/services/xml/rss/nyt/Opinion.xml'
-        }
-
-        all_headlines = {}
-        for section, url in feeds.items():
-            try:
-                entries = self._parse_feed(url, self.max_headlines)
-                headlines = []
-                for entry in entries:
-                    headline = self._entry_to_headline(entry)
-                    if headline:
-                        headlines.append(headline)
-
-                if headlines:
-                    all_headlines[section] = headlines
-                    logger.info(f"NY Times {section}: {len(headlines)} headlines")
-
-            except Exception as e:
-                logger.error(f"Error fetching NY Times {section}: {e}")
-
-        return all_headlines
-
-    def fetch_globe_and_mail(self) -> dict:
-        """Fetch Globe and Mail headlines via RSS feeds"""
-        feeds = {
-            'Canada': 'https://www.theglobeandmail.com/arc/outboundfeeds/rss/category/canada/',
-            'Politics': 'https://www.theglobeandmail.com/arc/outboundfeeds/rss/category/politics/',
-            'Opinion': 'https://www.theglobeandmail.com/arc/outboundfeeds/rss/category/opinion/'
-        }
-
-        all_headlines = {}
-        for section, url in feeds.items():
-            try:
-                entries = self._parse_feed(url, 4)
-                headlines = []
-                for entry in entries:
-                    headline = self._entry_to_headline(entry)
-                    if headline:
-                        headlines.append(headline)
-
-                if headlines:
-                    all_headlines[section] = headlines
-                    logger.info(f"Globe and Mail {section}: {len(headlines)} headlines")
-
-            except Exception as e:
-                logger.error(f"Error fetching Globe and Mail {section}: {e}")
-
-        return all_headlines
-
-    def fetch_lapresse(self) -> dict:
-        """Fetch La Presse headlines via RSS feeds"""
-        # La Presse RSS feeds
-        feeds = {
-            'Actualités': 'https://www.lapresse.ca/actualites/rss',
-            'International': 'https://www.lapresse.ca/international/rss',
-            'Affaires': 'https://www.lapresse.ca/affaires/rss'
-        }
-
+    def _feed_jobs(self, source: str, feeds: dict, max_items: Optional[int]) -> list:
+        """Build fetch jobs for every section feed of a source"""
+        return [(source, section, url, max_items) for section, url in feeds.items()]
+
+    def _fetch_feeds(self, jobs: list) -> dict:
+        """Fetch all feed jobs concurrently, bucketed by source and section"""
+        urls = list(dict.fromkeys(url for _, _, url, _ in jobs))
+        cache = self._load_feed_cache()
+        responses = asyncio.run(self._download_feeds(urls, cache))
+        self._save_feed_cache(cache)
+        parsed = {url: self._parse_feed(url, response) for url, response in responses.items()}
+
+        fetched = {}
+        for source, section, url, max_items in jobs:
+            fetched.setdefault(source, {})[section] = parsed[url][:max_items]
+        return fetched
+
+    def _headlines_by_section(self, source: str, entries_by_section: dict) -> dict:
+        """Convert per-section feed entries to headline dicts"""
         all_headlines = {}
-        for section, url in feeds.items():
+        for section, entries in entries_by_section.items():
             try:
-                entries = self._parse_feed(url, self.max_headlines)
                 headlines = []
                 for entry in entries:
                     headline = self._entry_to_headline(entry)
@@ -140,118 +217,178 @@ class NewsScrapers:
 
                 if headlines:
                     all_headlines[section] = headlines
-                    logger.info(f"La Presse {section}: {len(headlines)} headlines")
+                    logger.info("%s %s: %d headlines", source, section, len(headlines))
 
             except Exception as e:
-                logger.error(f"Error fetching La Presse {section}: {e}")
+                logger.error("Error fetching %s %s: %s", source, section, e)
 
         return all_headlines
 
-    def fetch_axios(self) -> list:
-        """Fetch Axios headlines via RSS feed"""
+    def _axios_headlines(self, entries: list) -> list:
+        """Convert Axios feed entries to headline dicts"""
         try:
-            # Axios main RSS feed
-            url = 'https://api.axios.com/feed/'
-            entries = self._parse_feed(url, self.max_headlines)
-
             headlines = []
             for entry in entries:
                 headline = self._entry_to_headline(entry)
                 if headline:
                     headlines.append(headline)
 
-            logger.info(f"Axios: {len(headlines)} headlines")
+            logger.info("Axios: %d headlines", len(headlines))
             return headlines
 
         except Exception as e:
-            logger.error(f"Error fetching Axios: {e}")
+            logger.error("Error fetching Axios: %s", e)
             return []
 
-    def fetch_substacks(self, usernames: list, hours: int = 24) -> list:
-        """Fetch recent posts from specific Substack accounts"""
-        cutoff = datetime.now() - timedelta(hours=hours)
+    def _recent_entries(self, entries: list, cutoff: datetime) -> list:
+        """Return (entry, pub_date) pairs for entries published after the cutoff"""
+        dated = [(entry, self._parse_date(entry)) for entry in entries]
+        return [(entry, pub_date) for entry, pub_date in dated if pub_date and pub_date > cutoff]
+
+    def _recent_substack_posts(self, entries_by_username: dict, hours: int) -> list:
+        """Filter Substack feed entries to posts within the time window"""
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=hours)
         recent_posts = []
 
-        for username in usernames:
+        for username, entries in entries_by_username.items():
             try:
-                feed_url = f"https://{username}.substack.com/feed"
-                feed = feedparser.parse(feed_url)
+                for entry, pub_date in self._recent_entries(entries, cutoff):
+                    title = entry.get('title', '').strip()
+                    link = entry.get('link', '').strip()
+
+                    if title:
+                        recent_posts.append({
+                            'title': f"@{username}: {title}",
+                            'url': link,
+                            'summary': f"Posted {pub_date.strftime('%b %d at %H:%M')}"
+                        })
+                        logger.info("Found Substack post from @%s: %s...", username, title[:50])
 
-                if not feed.entries:
-                    continue
+            except Exception as e:
+                logger.error("Error fetching Substack @%s: %s", username, e)
 
-                for entry in feed.entries:
-                    pub_date = self._parse_date(entry)
-                    if not pub_date:
-                        continue
+        return recent_posts
 
-                    if pub_date > cutoff:
-                        title = entry.get('title', '').strip()
-                        link = entry.get('link', '').strip()
+    def _recent_podcast_episodes(self, entries_by_podcast: dict, hours: int) -> list:
+        """Filter podcast feed entries to episodes within the time window"""
+        cutoff = datetime.now(timezone.utc).replace(tzinfo=None) - timedelta(hours=hours)
+        recent_episodes = []
 
-                        if title:
-                            recent_posts.append({
-                                'title': f"@{username}: {title}",
-                                'url': link,
-                                'summary': f"Posted {pub_date.strftime('%b %d at %H:%M')}"
-                            })
-                            logger.info(f"Found Substack post from @{username}: {title[:50]}...")
+        for podcast_name, entries in entries_by_podcast.items():
+            try:
+                for entry, pub_date in self._recent_entries(entries, cutoff):
+                    title = entry.get('title', '').strip()
+                    link = entry.get('link', '').strip()
+
+                    if title:
+                        recent_episodes.append({
+                            'title': f"{podcast_name}: {title}",
+                            'url': link,
+                            'summary': f"Published {pub_date.strftime('%b %d')}"
+                        })
+                        logger.info("Found episode from %s: %s...", podcast_name, title[:50])
 
             except Exception as e:
-                logger.error(f"Error fetching Substack @{username}: {e}")
+                logger.error("Error fetching podcast %s: %s", podcast_name, e)
 
-        return recent_posts
+        return recent_episodes
+
+    def _substack_feeds(self, usernames: list) -> dict:
+        """Map Substack usernames to their RSS feed URLs"""
+        return {username: f"https://{username}.substack.com/feed" for username in usernames}
+
+    def fetch_nytimes(self) -> dict:
+        """Fetch NY Times headlines via official RSS feeds"""
+        jobs = self._feed_jobs('NY Times', NYTIMES_FEEDS, self.max_headlines)
+        fetched = self._fetch_feeds(jobs)
+        return self._headlines_by_section('NY Times', fetched.get('NY Times', {}))
+
+    def fetch_globe_and_mail(self) -> dict:
+        """Fetch Globe and Mail headlines via RSS feeds"""
+        jobs = self._feed_jobs('Globe and Mail', GLOBE_AND_MAIL_FEEDS, 4)
+        fetched = self._fetch_feeds(jobs)
+        return self._headlines_by_section('Globe and Mail', fetched.get('Globe and Mail', {}))
+
+    def fetch_lapresse(self) -> dict:
+        """Fetch La Presse headlines via RSS feeds"""
+        jobs = self._feed_jobs('La Presse', LAPRESSE_FEEDS, self.max_headlines)
+        fetched = self._fetch_feeds(jobs)
+        return self._headlines_by_section('La Presse', fetched.get('La Presse', {}))
+
+    def fetch_axios(self) -> list:
+        """Fetch Axios headlines via RSS feed"""
+        jobs = self._feed_jobs('Axios', AXIOS_FEEDS, self.max_headlines)
+        fetched = self._fetch_feeds(jobs)
+        return self._axios_headlines(fetched.get('Axios', {}).get('Top Stories', []))
+
+    def fetch_substacks(self, usernames: list, hours: int = 24) -> list:
+        """Fetch recent posts from specific Substack accounts"""
+        jobs = self._feed_jobs('Substack', self._substack_feeds(usernames), None)
+        fetched = self._fetch_feeds(jobs)
+        return self._recent_substack_posts(fetched.get('Substack', {}), hours)
 
     def fetch_podcasts(self, feeds: dict, hours: int = 48) -> list:
         """Fetch recent podcast episodes"""
-        cutoff = datetime.now() - timedelta(hours=hours)
-        recent_episodes = []
+        jobs = self._feed_jobs('Podcasts', feeds, None)
+        fetched = self._fetch_feeds(jobs)
+        return self._recent_podcast_episodes(fetched.get('Podcasts', {}), hours)
+
+    def fetch_all(self, substack_usernames: list, podcast_feeds: dict,
+                  substack_hours: int = 24, podcast_hours: int = 48) -> dict:
+        """Fetch every source in one concurrent batch, keyed by digest source name"""
+        jobs = (
+            self._feed_jobs('NY Times', NYTIMES_FEEDS, self.max_headlines)
+            + self._feed_jobs('Globe and Mail', GLOBE_AND_MAIL_FEEDS, 4)
+            + self._feed_jobs('La Presse', LAPRESSE_FEEDS, self.max_headlines)
+            + self._feed_jobs('Axios', AXIOS_FEEDS, self.max_headlines)
+            + self._feed_jobs('Substack', self._substack_feeds(substack_usernames), None)
+            + self._feed_jobs('Podcasts', podcast_feeds, None)
+        )
+        fetched = self._fetch_feeds(jobs)
 
-        for podcast_name, feed_url in feeds.items():
-            try:
-                feed = feedparser.parse(feed_url)
+        all_headlines = {}
 
-                if not feed.entries:
-                    continue
+        nyt_headlines = self._headlines_by_section('NY Times', fetched.get('NY Times', {}))
+        if nyt_headlines:
+            all_headlines['NEW YORK TIMES'] = nyt_headlines
 
-                for entry in feed.entries:
-                    pub_date = self._parse_date(entry)
-                    if not pub_date:
-                        continue
+        globe_headlines = self._headlines_by_section('Globe and Mail', fetched.get('Globe and Mail', {}))
+        if globe_headlines:
+            all_headlines['GLOBE AND MAIL'] = globe_headlines
 
-                    if pub_date > cutoff:
-                        title = entry.get('title', '').strip()
-                        link = entry.get('link', '').strip()
+        lapresse_headlines = self._headlines_by_section('La Presse', fetched.get('La Presse', {}))
+        if lapresse_headlines:
+            all_headlines['LA PRESSE'] = lapresse_headlines
 
-                        if title:
-                            recent_episodes.append({
-                                'title': f"{podcast_name}: {title}",
-                                'url': link,
-                                'summary': f"Published {pub_date.strftime('%b %d')}"
-                            })
-                            logger.info(f"Found episode from {podcast_name}: {title[:50]}...")
+        axios_headlines = self._axios_headlines(fetched.get('Axios', {}).get('Top Stories', []))
+        if axios_headlines:
+            all_headlines['AXIOS'] = {'Top Stories': axios_headlines}
 
-            except Exception as e:
-                logger.error(f"Error fetching podcast {podcast_name}: {e}")
+        # Substack and Podcasts are always included so the email can say "nothing new"
+        substack_posts = self._recent_substack_posts(fetched.get('Substack', {}), substack_hours)
+        all_headlines['SUBSTACK'] = {'AI Writers': substack_posts}
 
-        return recent_episodes
+        podcast_episodes = self._recent_podcast_episodes(fetched.get('Podcasts', {}), podcast_hours)
+        all_headlines['PODCASTS'] = {'New Episodes': podcast_episodes}
+
+        return all_headlines
 
     def _parse_date(self, entry) -> Optional[datetime]:
-        """Parse publication date from feed entry"""
+        """Parse publication date from feed entry as a naive UTC datetime"""
         try:
-            if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                return datetime(*entry.published_parsed[:6])
-
-            if hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                return datetime(*entry.updated_parsed[:6])
-
-            if hasattr(entry, 'published') and entry.published:
-                import email.utils
-                parsed = email.utils.parsedate_tz(entry.published)
-                if parsed:
-                    return datetime(*parsed[:6])
+            # feedparser normalizes parsed dates to UTC struct_times
+            parsed = getattr(entry, 'published_parsed', None) or getattr(entry, 'updated_parsed', None)
+            if parsed:
+                return datetime(*parsed[:6])
+
+            published = getattr(entry, 'published', None)
+            if published:
+                pub_date = email.utils.parsedate_to_datetime(published)
+                if pub_date.tzinfo:
+                    pub_date = pub_date.astimezone(timezone.utc).replace(tzinfo=None)
+                return pub_date
 
         except Exception as e:
-            logger.debug(f"Could not parse date: {e}")
+            logger.debug("Could not parse date: %s", e)
 
         return None